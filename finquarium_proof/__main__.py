@@ -1,12 +1,13 @@
 """Entry point for proof generation"""
-import json
+import functools
 import logging
 import os
 import sys
-import traceback
 from pathlib import Path
 
-from finquarium_proof.config import settings
+import orjson
+
+from finquarium_proof.config import settings, SAFE_CONFIG
 from finquarium_proof.proof import Proof
 from finquarium_proof.db import db
 from finquarium_proof.models.contribution import ContributionType
@@ -18,15 +19,17 @@ OUTPUT_DIR = os.environ.get('OUTPUT_DIR', '/output')
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
 def determine_contribution_type() -> ContributionType:
     """
     Determine contribution type based on input directory contents.
     Default to Coinbase for backward compatibility.
-    """
-    input_dir = Path(settings.INPUT_DIR)
 
+    The input directory does not change during a run, so the result is cached.
+    """
     # TODO: This should come from a request
-    has_zip = any(input_dir.glob("*.zip"))
+    with os.scandir(settings.INPUT_DIR) as it:
+        has_zip = any(e.name.endswith('.zip') and e.is_file() for e in it)
 
     if has_zip:
         return ContributionType.BINANCE
@@ -49,24 +52,25 @@ def run() -> None:
         logger.info(f"Processing {contribution_type.value} contribution")
 
         # Log config (excluding sensitive data)
-        safe_config = settings.model_dump(exclude={'COINBASE_TOKEN', 'POSTGRES_URL', 'DB_PASSWORD', 'PROXY_API_KEY', 'PROXY_URL'})
-        logger.info("Using configuration:")
-        logger.info(json.dumps(safe_config, indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Using configuration: %s", orjson.dumps(dict(SAFE_CONFIG), option=orjson.OPT_INDENT_2).decode())
 
         # Initialize and run proof generation
-        proof = Proof(settings)
-        proof_response = proof.generate(contribution_type)
+        with Proof(settings) as proof:
+            proof_response = proof.generate(contribution_type)
 
         # Save results
-        output_path = os.path.join(settings.OUTPUT_DIR, "results.json")
-        with open(output_path, 'w') as f:
-            json.dump(proof_response.model_dump(), f, indent=2)
+        proof_json = proof_response.model_dump_json(indent=2)
+        Path(settings.OUTPUT_DIR, "results.json").write_text(proof_json)
 
-        logger.info(f"Proof generation complete: {proof_response.model_dump()}")
+        logger.info(
+            f"Proof generation complete: valid={proof_response.valid} "
+            f"score={proof_response.score} file_id={settings.FILE_ID}"
+        )
+        logger.debug("Proof response: %s", proof_json)
 
-    except Exception as e:
-        logger.error(f"Error during proof generation: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error during proof generation")
         db.dispose()  # Clean up database resources on error
         sys.exit(1)
     finally:
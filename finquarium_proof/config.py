@@ -1,8 +1,14 @@
 """Application configuration and environment settings"""
-from typing import Optional
+import functools
+import re
+from types import MappingProxyType
+from typing import Optional, Tuple
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Bucket is the first host label, key is the path without its leading slashes
+S3_URL_PATTERN = re.compile(r'[^:/]+://([^./]*)[^/?#]*/*([^?#]*)')
+
 class S3Settings(BaseModel):
     """S3 specific settings"""
     access_key_id: str = Field(..., description="AWS access key ID")
@@ -32,6 +38,7 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str = Field(..., description="AWS access key ID")
     AWS_SECRET_ACCESS_KEY: str = Field(..., description="AWS secret access key")
     AWS_REGION: str = Field(default="us-east-1", description="AWS region")
+    S3_OBJECT_ACL: Optional[str] = Field("public-read", description="Canned ACL for uploaded files; empty to rely on the bucket policy")
 
     # Optional context settings - can be None if not provided
     DLP_ID: Optional[int] = Field(13, description="Data Liquidity Pool ID")
@@ -40,11 +47,14 @@ class Settings(BaseSettings):
     JOB_ID: Optional[int] = Field(0, description="TEE job ID")
     OWNER_ADDRESS: Optional[str] = Field("0x34A3706B00B20C7AE4cff145Ab255e9E0818fE20", description="Owner's wallet address")
 
+    # Database schema management
+    AUTO_CREATE_TABLES: bool = Field(False, description="Create missing database tables on startup")
+
     # Input/Output directories with defaults
     INPUT_DIR: str = Field("/input", description="Directory containing input files")
     OUTPUT_DIR: str = Field("/output", description="Directory for output files")
 
-    @property
+    @functools.cached_property
     def s3_settings(self) -> S3Settings:
         """Get S3 settings as a separate model"""
         return S3Settings(
@@ -53,13 +63,44 @@ class Settings(BaseSettings):
             region=self.AWS_REGION
         )
 
+    @functools.cached_property
+    def s3_target(self) -> Tuple[str, str]:
+        """Get the (bucket, key) that FILE_URL points to, parsed once"""
+        match = S3_URL_PATTERN.match(self.FILE_URL or '')
+        if not match:
+            raise ValueError(f"Invalid S3 URL: {self.FILE_URL}")
+        return match.group(1), match.group(2)
+
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
-        case_sensitive=True
+        case_sensitive=True,
+        frozen=True
     )
 
-settings = Settings()
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment once per process"""
+    return Settings()
+
+settings = get_settings()
+
+# Settings that must never be logged
+SENSITIVE_SETTINGS = frozenset({
+    'DB_PASSWORD',
+    'COINBASE_TOKEN',
+    'COINBASE_ENCRYPTED_REFRESH_TOKEN',
+    'BINANCE_API_KEY',
+    'BINANCE_API_SECRET',
+    'PROXY_URL',
+    'PROXY_API_KEY',
+    'ENCRYPTION_KEY',
+    'AWS_ACCESS_KEY_ID',
+    'AWS_SECRET_ACCESS_KEY',
+})
+
+# Read-only copy of the settings safe to log, computed once per run
+SAFE_CONFIG = MappingProxyType(settings.model_dump(exclude=SENSITIVE_SETTINGS))
 
 # Constants
 MAX_POINTS = 630
\ No newline at end of file
@@ -5,10 +5,12 @@ import logging
 from contextlib import contextmanager
 from typing import Generator
 
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from finquarium_proof.config import settings
 from finquarium_proof.models.db import Base
 from finquarium_proof.db_config import DatabaseManager
 
@@ -41,7 +43,8 @@ class Database:
 
     def init(self) -> None:
         """
-        Initialize database connection and create tables.
+        Initialize database connection and, if AUTO_CREATE_TABLES is set,
+        create missing tables.
 
         This should be called once at application startup.
 
@@ -51,8 +54,21 @@ class Database:
         try:
             # Get connection string with credentials
             connection_string = self._get_connection_string()
-            self._engine = create_engine(connection_string)
-            Base.metadata.create_all(self._engine)
+            # Single short-lived job: keep the pool small and drop stale
+            # connections before use instead of failing mid-proof
+            self._engine = create_engine(
+                connection_string,
+                pool_size=2,
+                max_overflow=2,
+                pool_pre_ping=True,
+                pool_recycle=300,
+                connect_args={'keepalives': 1, 'keepalives_idle': 30},
+                json_serializer=lambda obj: orjson.dumps(obj).decode(),
+                json_deserializer=orjson.loads
+            )
+            # Schemas are pre-provisioned in the TEE, skip the per-table existence checks
+            if settings.AUTO_CREATE_TABLES:
+                Base.metadata.create_all(self._engine, checkfirst=True)
             self._SessionLocal = sessionmaker(bind=self._engine)
             logger.info("Database initialized successfully")
 
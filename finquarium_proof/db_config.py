@@ -1,9 +1,7 @@
 # finquarium_proof/db_config.py
 """Database configuration and credentials management for TEE"""
 from dataclasses import dataclass
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 
 from finquarium_proof.config import settings
 
@@ -32,24 +30,29 @@ LOCAL_CONFIG = {
     'SSL_MODE': 'disable'
 }
 
+# Database configuration by DLP_ID
+NETWORK_CONFIGS = {
+    13: MAINNET_CONFIG,
+    25: TESTNET_CONFIG,
+    0: LOCAL_CONFIG,
+}
+
 def determine_network_config() -> dict:
     """Determine database configuration based on DLP_ID."""
-    if not settings.DLP_ID:
+    if settings.DLP_ID is None:
         raise ValueError("DLP_ID setting is required")
 
-    if settings.DLP_ID == 13:
-        return MAINNET_CONFIG
-    elif settings.DLP_ID == 25:
-        return TESTNET_CONFIG
-    elif settings.DLP_ID == 0:
-        return LOCAL_CONFIG
-    else:
+    try:
+        return NETWORK_CONFIGS[settings.DLP_ID]
+    except KeyError:
         raise ValueError(f"Invalid DLP_ID {settings.DLP_ID}. Must be 13 (mainnet) or 25 (testnet) or 0 (local)")
 
 # Select configuration based on DLP_ID
 DB_CONFIG = determine_network_config()
 
-@dataclass
+CONNECTION_TEMPLATE = "postgresql://{user}:{password}@{host}:{port}/{name}?sslmode={ssl_mode}"
+
+@dataclass(slots=True, frozen=True)
 class DatabaseCredentials:
     """Database credentials container with validation"""
     host: str
@@ -61,9 +64,13 @@ class DatabaseCredentials:
 
     def to_connection_string(self) -> str:
         """Generate database connection string with proper escaping"""
-        return (
-            f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/"
-            f"{self.name}?sslmode={self.ssl_mode}"
+        return CONNECTION_TEMPLATE.format(
+            user=self.user,
+            password=quote(self.password, safe=''),
+            host=self.host,
+            port=self.port,
+            name=self.name,
+            ssl_mode=self.ssl_mode
         )
 
     @classmethod
@@ -127,6 +134,10 @@ class DatabasePasswordEncryption:
         Returns:
             Hex string of encrypted password
         """
+        # Only used by client-side tooling, keep it off the TEE import path
+        from cryptography.hazmat.primitives import serialization, hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
         # Read TEE public key
         with open(public_key_path, 'rb') as key_file:
             public_key = serialization.load_pem_public_key(key_file.read())
@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BinanceTransaction:
     timestamp: datetime  # Date(UTC)
     symbol: str         # Pair
@@ -15,7 +15,7 @@ class BinanceTransaction:
     fee: Decimal       # Fee amount
     fee_asset: str     # Fee asset parsed from Fee column
 
-@dataclass
+@dataclass(slots=True)
 class BinanceValidationData:
     account_id_hash: str
     transactions: List[BinanceTransaction]
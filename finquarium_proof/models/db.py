@@ -1,7 +1,7 @@
 """SQLAlchemy database models for storing contribution data"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, BigInteger, JSON
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Float, DateTime, BigInteger, JSON, Index
+from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
@@ -33,7 +33,7 @@ class ContributionProof(Base):
     __tablename__ = 'contribution_proofs'
 
     id = Column(Integer, primary_key=True)
-    account_id_hash = Column(String, nullable=False, index=True)
+    account_id_hash = Column(String, nullable=False)
     file_id = Column(BigInteger, nullable=False)
     file_url = Column(String, nullable=False)
     job_id = Column(String, nullable=False)
@@ -43,4 +43,9 @@ class ContributionProof(Base):
     ownership = Column(Float, nullable=False)
     quality = Column(Float, nullable=False)
     uniqueness = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Serves per-account history lookups, newest first
+    __table_args__ = (
+        Index('ix_contrib_hash_created', 'account_id_hash', created_at.desc()),
+    )
@@ -1,6 +1,6 @@
 """ProofResponse model definition"""
 from typing import Dict, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class FileInfo(BaseModel):
     """Information about the processed file"""
@@ -35,6 +35,8 @@ class ProofResponse(BaseModel):
         uniqueness: Score 0-1 showing data uniqueness vs others
         attributes: Extra context about the encrypted file
     """
+    model_config = ConfigDict(validate_assignment=False, extra='forbid')
+
     dlp_id: int
     valid: bool = False
     score: float = 0.0
@@ -1,13 +1,19 @@
 """Main proof generation logic"""
+import functools
 import hashlib
-import json
+import hmac
+import io
 import logging
+import mmap
 import os
-from typing import Dict, Any, Tuple
-import tempfile
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 import gnupg
+import orjson
 import boto3
-from urllib.parse import urlparse
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
 
 from finquarium_proof.config import Settings, MAX_POINTS
@@ -19,10 +25,38 @@ from finquarium_proof.services.binance import BinanceValidator
 from finquarium_proof.services.storage import StorageService
 from finquarium_proof.scoring import ContributionScorer
 from finquarium_proof.db import db
-from finquarium_proof.utils.json_encoder import DateTimeEncoder
 
 logger = logging.getLogger(__name__)
 
+# Canonical form of a hashed user ID: lowercase hex SHA-256
+USER_ID_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+# Shared S3 client settings; the pool must cover the concurrent upload parts
+S3_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    max_pool_connections=16
+)
+
+# Multipart settings for the encrypted contribution upload
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """Create one S3 client per process so uploads reuse its connection pool"""
+    return boto3.session.Session().client('s3', config=S3_CLIENT_CONFIG)
+
+@functools.lru_cache(maxsize=1)
+def get_gpg() -> gnupg.GPG:
+    """Create the GPG wrapper once per process; construction probes the gpg binary"""
+    # Symmetric encryption never consults the trust database
+    return gnupg.GPG(options=['--no-auto-check-trustdb', '--trust-model=always'])
+
 class Proof:
     """Handles proof generation and validation"""
 
@@ -31,8 +65,7 @@ class Proof:
         self.settings = settings
         self.scorer = ContributionScorer()
         self.storage = StorageService(db.get_session())
-        self.s3_client = boto3.client('s3')
-        self.gpg = gnupg.GPG()
+        self._saved_user_id_hash = None
 
         # Initialize API clients based on provided credentials
         if self.settings.COINBASE_TOKEN:
@@ -50,44 +83,96 @@ class Proof:
         else:
             self.binance_validator = None
 
+    @functools.cached_property
+    def s3_client(self):
+        """S3 client, built on first upload; proofs that upload nothing never create it"""
+        return get_s3_client()
+
+    @functools.cached_property
+    def gpg(self) -> gnupg.GPG:
+        """GPG wrapper, built on first encryption"""
+        return get_gpg()
+
+    def __enter__(self) -> 'Proof':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the storage session so its connection returns to the pool"""
+        self.storage.session.close()
+
+    def _load_saved_user_id_hash(self) -> Optional[str]:
+        """Read the hashed user ID from the saved JSON file, parsing it at most once"""
+        if self._saved_user_id_hash is not None:
+            return self._saved_user_id_hash
+
+        with os.scandir(self.settings.INPUT_DIR) as it:
+            for entry in it:
+                if entry.name.lower().endswith('.json') and entry.is_file():
+                    # Parse straight from the mapped file, without copying it into a bytes object
+                    with open(entry.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            saved_data = orjson.loads(view)
+                    # Keep only the hash; the transaction history is refetched anyway
+                    self._saved_user_id_hash = (saved_data.get('user') or {}).get('id_hash')
+                    return self._saved_user_id_hash
+
+        raise FileNotFoundError("No decrypted JSON file found in input directory")
+
     def _load_and_validate_user_id_hash(self) -> Tuple[str, str]:
         """Load and validate hashed user ID from saved file"""
         if not self.coinbase:
             raise ValueError("Coinbase credentials not provided")
 
-        for filename in os.listdir(self.settings.INPUT_DIR):
-            if os.path.splitext(filename)[1].lower() == '.json':
-                file_path = os.path.join(self.settings.INPUT_DIR, filename)
-                with open(file_path, 'r') as f:
-                    saved_data = json.load(f)
+        # Extract hashed user ID from saved data
+        saved_user_id_hash = self._load_saved_user_id_hash()
+        if not saved_user_id_hash:
+            raise ValueError("No hashed user ID found in saved data")
 
-                # Extract hashed user ID from saved data
-                saved_user_id_hash = saved_data.get('user', {}).get('id_hash')
-                if not saved_user_id_hash:
-                    raise ValueError("No hashed user ID found in saved data")
+        # Get fresh user info and hash it
+        fresh_user = self.coinbase.get_user_info()['data']
+        fresh_user_id_digest = hashlib.sha256(fresh_user['id'].encode()).digest()
 
-                # Get fresh user info and hash it
-                fresh_user = self.coinbase.get_user_info()['data']
-                fresh_user_id_hash = hashlib.sha256(fresh_user['id'].encode()).hexdigest()
-
-                if saved_user_id_hash != fresh_user_id_hash:
-                    print(f"Saved: {saved_user_id_hash}")
-                    print(f"Fresh: {fresh_user_id_hash}")
-                    raise ValueError("User ID hash mismatch")
-
-                return saved_user_id_hash, self.settings.FILE_URL
-
-        raise FileNotFoundError("No decrypted JSON file found in input directory")
-
-    def calculate_checksum(self, path: str) -> str:
-        """Calculate SHA256 checksum of a file."""
-        checksum = hashlib.sha256()
-        with open(path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                checksum.update(chunk)
-        return checksum.hexdigest()
+        # Only the canonical lowercase hex form is accepted; bytes.fromhex alone
+        # would also take uppercase or space-separated variants
+        if isinstance(saved_user_id_hash, str) and USER_ID_HASH_PATTERN.fullmatch(saved_user_id_hash):
+            saved_user_id_digest = bytes.fromhex(saved_user_id_hash)
+        else:
+            saved_user_id_digest = b''
+
+        # Compare raw digests in constant time
+        fresh_user_id_hash = fresh_user_id_digest.hex()
+        if not hmac.compare_digest(saved_user_id_digest, fresh_user_id_digest):
+            logger.warning(f"User ID hash mismatch: saved={saved_user_id_hash} fresh={fresh_user_id_hash}")
+            raise ValueError("User ID hash mismatch")
+
+        # Return the hash derived from the fresh Coinbase user, never the saved string
+        return fresh_user_id_hash, self.settings.FILE_URL
+
+    def _upload_encrypted(self, encrypted_data: bytes, bucket: str, key: str) -> None:
+        """Upload the encrypted file to S3"""
+        extra_args = {'ContentType': 'application/octet-stream'}
+        if self.settings.S3_OBJECT_ACL:
+            extra_args['ACL'] = self.settings.S3_OBJECT_ACL
+
+        # Upload encrypted data to S3: one PUT of the buffer for typical payloads,
+        # parallel parts only once it crosses the multipart threshold
+        if len(encrypted_data) < S3_TRANSFER_CONFIG.multipart_threshold:
+            self.s3_client.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=encrypted_data,
+                **extra_args
+            )
+        else:
+            self.s3_client.upload_fileobj(
+                io.BytesIO(encrypted_data),
+                bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=S3_TRANSFER_CONFIG
+            )
 
-    def _encrypt_and_upload(self, data: Dict[str, Any], s3_url: str) -> Tuple[str, str]:
+    def _encrypt_and_upload(self, data: Dict[str, Any], bucket: str, key: str) -> Tuple[str, str]:
         """
         Encrypt data using GPG and upload to S3.
 
@@ -95,87 +180,90 @@ class Proof:
             Tuple[str, str]: (encrypted_checksum, decrypted_checksum)
         """
         try:
-            # Create temporary directory for file operations
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Write data to temporary file
-                unencrypted_path = os.path.join(temp_dir, "data.json")
-                with open(unencrypted_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, cls=DateTimeEncoder)
-
-                # Calculate decrypted checksum
-                decrypted_checksum = self.calculate_checksum(unencrypted_path)
-
-                # Encrypt the file using GPG
-                encrypted_path = os.path.join(temp_dir, "encrypted_data")
-                with open(unencrypted_path, 'rb') as f:
-                    status = self.gpg.encrypt_file(
-                        fileobj_or_path=f,
-                        recipients='',
-                        output=encrypted_path,
-                        passphrase=self.settings.ENCRYPTION_KEY,
-                        armor=False,
-                        symmetric=True
-                    )
+            # Serialize once and hash the bytes in memory
+            payload = orjson.dumps(data)
+
+            # sha256 releases the GIL, so the plaintext is hashed on a worker
+            # thread while gpg encrypts it
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                decrypted_future = executor.submit(lambda: hashlib.sha256(payload).hexdigest())
+
+                # Encrypt through gpg's stdin/stdout pipes, no temporary files
+                status = self.gpg.encrypt(
+                    payload,
+                    recipients='',
+                    passphrase=self.settings.ENCRYPTION_KEY,
+                    armor=False,
+                    symmetric=True
+                )
 
                 if not status.ok:
                     raise Exception(f"Encryption failed: {status.status}")
 
-                # Calculate encrypted checksum
-                encrypted_checksum = self.calculate_checksum(encrypted_path)
+                encrypted_data = status.data
 
-                # Parse S3 URL
-                s3_url_parsed = urlparse(s3_url)
-                bucket = s3_url_parsed.netloc.split('.')[0]
-                key = s3_url_parsed.path.lstrip('/')
+                # Start the upload before hashing the ciphertext so both proceed together
+                upload_future = executor.submit(self._upload_encrypted, encrypted_data, bucket, key)
+                encrypted_checksum = hashlib.sha256(encrypted_data).hexdigest()
+                decrypted_checksum = decrypted_future.result()
+                upload_future.result()
 
-                # Upload encrypted file to S3
-                with open(encrypted_path, 'rb') as f:
-                    self.s3_client.put_object(
-                        Bucket=bucket,
-                        Key=key,
-                        Body=f,
-                        ContentType='application/octet-stream',
-                        ACL='public-read'
-                    )
-                logger.info(f"Successfully uploaded encrypted file to s3://{bucket}/{key}")
+            logger.info(f"Successfully uploaded encrypted file to s3://{bucket}/{key}")
 
-                return encrypted_checksum, decrypted_checksum
+            return encrypted_checksum, decrypted_checksum
 
         except Exception as e:
             logger.error(f"Error encrypting and uploading file: {e}")
             raise
 
+    def _upload_contribution(self, data: Dict[str, Any], differential_points: int) -> Tuple[str, str]:
+        """
+        Encrypt and upload the contribution to FILE_URL when it earns new points.
+
+        Returns:
+            Tuple[str, str]: (encrypted_checksum, decrypted_checksum), both empty when
+            nothing was uploaded, since no object at FILE_URL would match them
+        """
+        if differential_points <= 0:
+            return '', ''
+        return self._encrypt_and_upload(data, *self.settings.s3_target)
+
     def _convert_binance_to_contribution_data(self, validation_data: BinanceValidationData) -> ContributionData:
         """Convert BinanceValidationData to ContributionData for storage compatibility"""
 
-        # Convert BinanceTransactions to common Transaction format
+        # Convert BinanceTransactions to common Transaction format,
+        # collecting unique assets in the same pass
         transactions = []
+        unique_assets = set()
         for tx in validation_data.transactions:
-            transactions.append(Transaction(
+            transaction = Transaction(
                 type='trade',
                 asset=tx.symbol,
                 quantity=float(tx.quantity),
                 native_amount=float(tx.amount),
                 timestamp=tx.timestamp
-            ))
+            )
+            transactions.append(transaction)
+            unique_assets.add(tx.symbol)
 
         # Create TradingStats from validation data
         stats = TradingStats(
             total_volume=float(validation_data.total_volume),
-            transaction_count=len(validation_data.transactions),
-            unique_assets=list(set(tx.symbol for tx in validation_data.transactions)),
+            transaction_count=len(transactions),
+            unique_assets=list(unique_assets),
             activity_period_days=(validation_data.end_time - validation_data.start_time).days,
             first_transaction_date=validation_data.start_time,
             last_transaction_date=validation_data.end_time
         )
 
-        # Create raw data structure matching Coinbase format
+        # Create raw data structure matching Coinbase format;
+        # orjson serializes the dataclasses directly
         raw_data = {
             'user': {
                 'id_hash': validation_data.account_id_hash
             },
-            'stats': stats.__dict__,
-            'transactions': [tx.__dict__ for tx in transactions]
+            'stats': stats,
+            'transactions': transactions
         }
 
         return ContributionData(
@@ -204,16 +292,29 @@ class Proof:
     def _generate_coinbase_proof(self) -> ProofResponse:
         """Coinbase proof generation logic"""
         try:
-            # Validate user ID ownership
-            user_id, file_url = self._load_and_validate_user_id_hash()
+            # Bind run context once instead of re-reading settings throughout
+            dlp_id = self.settings.DLP_ID or 0
+            file_id = self.settings.FILE_ID or 0
+            job_id = self.settings.JOB_ID or ''
+            owner_address = self.settings.OWNER_ADDRESS or ''
 
-            # Fetch fresh data from Coinbase
-            fresh_data = self.coinbase.get_formatted_history()
+            # Validate user ID ownership; the returned hash is derived from the
+            # fresh Coinbase user ID, not read from the input file
+            account_id_hash, file_url = self._load_and_validate_user_id_hash()
 
-            # Check for existing contribution
-            has_existing, existing_data = self.storage.check_existing_contribution(
-                fresh_data.account_id_hash
-            )
+            # That hash is the account hash, so the DB lookup can run while the
+            # Coinbase history is being paged in
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                existing_future = executor.submit(self.storage.check_existing_contribution, account_id_hash)
+
+                # Fetch fresh data from Coinbase
+                fresh_data = self.coinbase.get_formatted_history()
+
+                # Check for existing contribution
+                has_existing, existing_data = existing_future.result()
+
+            if fresh_data.account_id_hash != account_id_hash:
+                raise ValueError("Coinbase account changed during proof generation")
 
             # Calculate fresh scores
             points_breakdown = self.scorer.calculate_score(fresh_data.stats)
@@ -234,15 +335,15 @@ class Proof:
                 final_score = self.scorer.normalize_score(differential_points, MAX_POINTS, False)
                 previously_rewarded = existing_data.times_rewarded > 0
 
-            # Encrypt and update file in S3
-            encrypted_checksum, decrypted_checksum = self._encrypt_and_upload(
+            # Encrypt and update file in S3, only when the contribution will be stored
+            encrypted_checksum, decrypted_checksum = self._upload_contribution(
                 fresh_data.raw_data,
-                file_url
+                differential_points
             )
 
             # Create proof response with differential scoring
             proof_response = ProofResponse(
-                dlp_id=self.settings.DLP_ID,
+                dlp_id=dlp_id,
                 valid=True,        # Always valid now, we just adjust the score
                 score=final_score,
                 authenticity=1.0,  # Data is fresh from Coinbase
@@ -264,13 +365,13 @@ class Proof:
                     'points_breakdown': points_breakdown,
                 },
                 metadata={
-                    'dlp_id': self.settings.DLP_ID or 0,
+                    'dlp_id': dlp_id,
                     'version': '1.0.0',
-                    'file_id': self.settings.FILE_ID or 0,
-                    'job_id': self.settings.JOB_ID or '',
-                    'owner_address': self.settings.OWNER_ADDRESS or '',
+                    'file_id': file_id,
+                    'job_id': job_id,
+                    'owner_address': owner_address,
                     'file': {
-                        'id': self.settings.FILE_ID or 0,
+                        'id': file_id,
                         'source': 'TEE',
                         'url': file_url,
                         'checksums': {
@@ -286,10 +387,10 @@ class Proof:
                 self.storage.store_contribution(
                     fresh_data,
                     proof_response,
-                    self.settings.FILE_ID or 0,
-                    self.settings.FILE_URL or '',
-                    self.settings.JOB_ID or '',
-                    self.settings.OWNER_ADDRESS or '',
+                    file_id,
+                    file_url or '',
+                    job_id,
+                    owner_address,
                     self.settings.COINBASE_ENCRYPTED_REFRESH_TOKEN or ''
                 )
 
@@ -302,12 +403,19 @@ class Proof:
     def _generate_binance_proof(self) -> ProofResponse:
         """Generate proof for Binance contribution"""
         try:
+            # Bind run context once instead of re-reading settings throughout
+            dlp_id = self.settings.DLP_ID or 0
+            file_id = self.settings.FILE_ID or 0
+            job_id = self.settings.JOB_ID or ''
+            owner_address = self.settings.OWNER_ADDRESS or ''
+            file_url = self.settings.FILE_URL
+
             # Find zip file
-            zip_file_path = None
-            for filename in os.listdir(self.settings.INPUT_DIR):
-                if filename.endswith('.zip'):
-                    zip_file_path = os.path.join(self.settings.INPUT_DIR, filename)
-                    break
+            with os.scandir(self.settings.INPUT_DIR) as it:
+                zip_file_path = next(
+                    (entry.path for entry in it if entry.name.endswith('.zip') and entry.is_file()),
+                    None
+                )
 
             if not zip_file_path:
                 raise FileNotFoundError("No zip file found in input directory")
@@ -347,14 +455,14 @@ class Proof:
                 final_score = self.scorer.normalize_score(differential_points, MAX_POINTS, False)
                 previously_rewarded = existing_data.times_rewarded > 0
 
-            # Encrypt and upload data
-            encrypted_checksum, decrypted_checksum = self._encrypt_and_upload(
+            # Encrypt and update file in S3, only when the contribution will be stored
+            encrypted_checksum, decrypted_checksum = self._upload_contribution(
                 contribution_data.raw_data,
-                self.settings.FILE_URL
+                differential_points
             )
 
             proof_response = ProofResponse(
-                dlp_id=self.settings.DLP_ID,
+                dlp_id=dlp_id,
                 valid=True,  # Always valid now, we just adjust the score
                 score=final_score,
                 authenticity=1.0,
@@ -380,15 +488,15 @@ class Proof:
                     }
                 },
                 metadata={
-                    'dlp_id': self.settings.DLP_ID or 0,
+                    'dlp_id': dlp_id,
                     'version': '1.0.0',
-                    'file_id': self.settings.FILE_ID or 0,
-                    'job_id': self.settings.JOB_ID or '',
-                    'owner_address': self.settings.OWNER_ADDRESS or '',
+                    'file_id': file_id,
+                    'job_id': job_id,
+                    'owner_address': owner_address,
                     'file': {
-                        'id': self.settings.FILE_ID or 0,
+                        'id': file_id,
                         'source': 'TEE',
-                        'url': self.settings.FILE_URL,
+                        'url': file_url,
                         'checksums': {
                             'encrypted': encrypted_checksum,
                             'decrypted': decrypted_checksum
@@ -402,10 +510,10 @@ class Proof:
                 self.storage.store_contribution(
                     contribution_data,
                     proof_response,
-                    self.settings.FILE_ID or 0,
-                    self.settings.FILE_URL or '',
-                    self.settings.JOB_ID or '',
-                    self.settings.OWNER_ADDRESS or '',
+                    file_id,
+                    file_url or '',
+                    job_id,
+                    owner_address,
                     ''  # No refresh token for Binance
                 )
 
@@ -3,18 +3,27 @@ import csv
 import hashlib
 import hmac
 import io
-import json
+import re
 import time
 import zipfile
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Dict, Tuple, Any
+import orjson
 import requests
 import logging
 from ..models.binance import BinanceTransaction, BinanceValidationData
 
 logger = logging.getLogger(__name__)
 
+# Splits a value like "0.00012BNB" into its numeric prefix and trailing asset
+NUMERIC_PREFIX = re.compile(r'([0-9.]*)(.*)', re.DOTALL)
+
+def split_amount(value: str) -> Tuple[Decimal, str]:
+    """Parse the leading numeric part of a CSV cell and return it with the remaining suffix"""
+    number, suffix = NUMERIC_PREFIX.match(value).groups()
+    return Decimal(number), suffix
+
 class BinanceAPI:
     def __init__(self, api_key: str, api_secret: str, proxy_url: str = None, proxy_api_key: str = None):
         self.API_URL = "https://api.binance.com"
@@ -84,7 +93,7 @@ class BinanceAPI:
             if response.status_code != 200:
                 raise Exception(f"Proxy request failed: {response.text}")
 
-            proxy_response = response.json()
+            proxy_response = orjson.loads(response.content)
 
             # Check if proxy response contains error information
             if isinstance(proxy_response, dict):
@@ -99,12 +108,12 @@ class BinanceAPI:
                 # If we have a body field, try to parse it
                 if 'body' in proxy_response:
                     try:
-                        parsed_body = json.loads(proxy_response['body'])
+                        parsed_body = orjson.loads(proxy_response['body'])
                         # Check for Binance error response
                         if isinstance(parsed_body, dict) and 'code' in parsed_body and parsed_body.get('code', 0) < 0:
                             raise Exception(f"Binance API error: {parsed_body}")
                         return parsed_body
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         raise Exception(f"Invalid JSON in proxy response body: {proxy_response['body']}")
 
             # If proxy_response doesn't match any error cases and is valid data, return it
@@ -114,7 +123,7 @@ class BinanceAPI:
             # Direct request
             response = requests.get(url, headers=headers)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
     def get_account_info(self) -> Dict:
         endpoint = "/api/v3/account"
@@ -193,38 +202,13 @@ class BinanceValidator:
 
         for row in reader:
             # Parse fee and fee asset
-            fee_str = row['Fee']
-            numeric_end = 0
-            for i, c in enumerate(fee_str):
-                if c.isdigit() or c == '.':
-                    numeric_end = i + 1
-                else:
-                    break
-
-            fee_amount = Decimal(fee_str[:numeric_end])
-            fee_asset = fee_str[numeric_end:]
+            fee_amount, fee_asset = split_amount(row['Fee'])
 
             # Parse executed quantity
-            executed_str = row['Executed']
-            numeric_end = 0
-            for i, c in enumerate(executed_str):
-                if c.isdigit() or c == '.':
-                    numeric_end = i + 1
-                else:
-                    break
-
-            executed_qty = Decimal(executed_str[:numeric_end])
+            executed_qty, _ = split_amount(row['Executed'])
 
             # Parse amount
-            amount_str = row['Amount']
-            numeric_end = 0
-            for i, c in enumerate(amount_str):
-                if c.isdigit() or c == '.':
-                    numeric_end = i + 1
-                else:
-                    break
-
-            amount = Decimal(amount_str[:numeric_end])
+            amount, _ = split_amount(row['Amount'])
 
             transaction = BinanceTransaction(
                 timestamp=datetime.strptime(row[date_column], '%Y-%m-%d %H:%M:%S'),
@@ -273,101 +257,66 @@ class BinanceValidator:
                 # Get trades from API without time range filtering
                 api_trades = self.api.get_my_trades(symbol)
 
+                # CSV rows on a pair the API has no trades for cannot be verified
                 if not api_trades:
                     logger.info(f"No trades found for {symbol}")
-                    continue
+                    return False, f"No API trades found for {symbol}"
 
-                # Create lookup of API trades with normalized values
+                # Index API trade times by their exact trade values so each CSV row
+                # is checked against only the trades it could match
                 api_trades_lookup = {}
                 for trade in api_trades:
                     # Convert API trade timestamp to UTC datetime for comparison
                     trade_time = datetime.utcfromtimestamp(trade['time'] / 1000)
-
-                    # Round values to 8 decimal places for consistent comparison
-                    trade_tuple = (
-                        trade_time,
-                        float(trade['price']),
-                        float(trade['qty']),
-                        float(trade['commission']),
+                    trade_key = (
+                        Decimal(trade['price']),
+                        Decimal(trade['qty']),
+                        Decimal(trade['commission']),
                         trade['commissionAsset'],
                         trade['isBuyer']
                     )
-                    api_trades_lookup[trade_tuple] = trade
+                    api_trades_lookup.setdefault(trade_key, []).append(trade_time)
 
                 logger.info(f"Found {len(api_trades)} trades for {symbol}")
                 logger.info(f"Found {len(txs)} trades in CSV export")
 
                 # Verify each transaction exists in API response
                 for tx in txs:
-                    # Convert transaction data to match API format
-                    is_buyer = tx.side.upper() == 'BUY'
-                    tx_tuple = (
-                        tx.timestamp,
-                        float(tx.price),
-                        float(tx.quantity),
-                        float(tx.fee),
-                        tx.fee_asset,
-                        is_buyer
-                    )
+                    tx_key = (tx.price, tx.quantity, tx.fee, tx.fee_asset, tx.side.upper() == 'BUY')
 
-                    # Debug print transaction details with timezone info
-                    logger.info(f"\nLooking for transaction (UTC):")
-                    logger.info(f"Time: {tx.timestamp} UTC")
-                    logger.info(f"Price: {tx.price}")
-                    logger.info(f"Quantity: {tx.quantity}")
-                    logger.info(f"Fee: {tx.fee} {tx.fee_asset}")
-                    logger.info(f"Side: {tx.side}")
-
-                    # Try to find matching trade with some tolerance for timestamp
-                    found_match = False
-                    for api_tuple in api_trades_lookup.keys():
-                        # Debug print API trade details for comparison
-                        logger.info(f"\nComparing with API trade (UTC):")
-                        logger.info(f"Time: {api_tuple[0]} UTC")
-                        logger.info(f"Price: {api_tuple[1]}")
-                        logger.info(f"Quantity: {api_tuple[2]}")
-                        logger.info(f"Fee: {api_tuple[3]} {api_tuple[4]}")
-                        logger.info(f"Side: {'BUY' if api_tuple[5] else 'SELL'}")
-
-                        # Check if values match within tolerance
-                        time_diff = abs((tx_tuple[0] - api_tuple[0]).total_seconds())
-                        price_matches = abs(tx_tuple[1] - api_tuple[1]) < 0.00000001
-                        qty_matches = abs(tx_tuple[2] - api_tuple[2]) < 0.00000001
-                        fee_matches = abs(tx_tuple[3] - api_tuple[3]) < 0.00000001
-                        asset_matches = tx_tuple[4] == api_tuple[4]
-                        side_matches = tx_tuple[5] == api_tuple[5]
-
-                        logger.info(f"Time difference: {time_diff} seconds")
-                        logger.info(f"Price matches: {price_matches}")
-                        logger.info(f"Quantity matches: {qty_matches}")
-                        logger.info(f"Fee matches: {fee_matches}")
-                        logger.info(f"Asset matches: {asset_matches}")
-                        logger.info(f"Side matches: {side_matches}")
-
-                        if (time_diff < 5 and price_matches and qty_matches and
-                                fee_matches and asset_matches and side_matches):
-                            found_match = True
-                            logger.info("FOUND MATCH!")
-                            break
+                    # Allow some tolerance for the export timestamp
+                    candidate_times = api_trades_lookup.get(tx_key, ())
+                    found_match = any(
+                        abs((tx.timestamp - trade_time).total_seconds()) < 5
+                        for trade_time in candidate_times
+                    )
 
                     if not found_match:
-                        logger.info("\nNo matching trade found!")
+                        logger.info(
+                            f"No matching trade found for {symbol} at {tx.timestamp} UTC: "
+                            f"price={tx.price} qty={tx.quantity} fee={tx.fee} {tx.fee_asset} side={tx.side}"
+                        )
                         return False, f"Transaction validation failed for {symbol} at {tx.timestamp}"
-                    else:
-                        logger.info("Trade validated successfully!")
-
-                return True, "All transactions validated successfully"
 
             except Exception as e:
                 logger.error(f"Error validating {symbol}: {str(e)}")
                 return False, f"Validation failed for {symbol}: {str(e)}"
 
+        return True, "All transactions validated successfully"
+
     def calculate_rewards(self, transactions: List[BinanceTransaction]) -> BinanceValidationData:
-        # Calculate metrics
-        total_volume = Decimal(sum(tx.amount for tx in transactions))
-        unique_assets = len(set(tx.symbol for tx in transactions))
-        start_time = min(tx.timestamp for tx in transactions)
-        end_time = max(tx.timestamp for tx in transactions)
+        # Calculate metrics in a single pass over the transactions
+        total_volume = Decimal(0)
+        symbols = set()
+        start_time = end_time = transactions[0].timestamp
+        for tx in transactions:
+            total_volume += tx.amount
+            symbols.add(tx.symbol)
+            if tx.timestamp < start_time:
+                start_time = tx.timestamp
+            elif tx.timestamp > end_time:
+                end_time = tx.timestamp
+        unique_assets = len(symbols)
 
         # Get account info for ID hash
         account_info = self.api.get_account_info()
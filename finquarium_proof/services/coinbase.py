@@ -1,16 +1,34 @@
 """Coinbase API integration service"""
 import hashlib
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from finquarium_proof.models.contribution import Transaction, TradingStats, ContributionData, ContributionType
 
 logger = logging.getLogger(__name__)
 
+# Accounts paged in parallel, kept low to stay within the API rate limit
+MAX_CONCURRENT_ACCOUNTS = 4
+
+# Minimum seconds between transaction page requests, across all accounts
+MIN_REQUEST_INTERVAL = 0.1
+
+# Seconds to wait for Coinbase to connect or respond
+REQUEST_TIMEOUT = 10
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a Coinbase 'YYYY-MM-DDTHH:MM:SSZ' timestamp into a naive UTC datetime"""
+    return datetime.fromisoformat(value.removesuffix('Z'))
+
 class CoinbaseAPI:
     """Handles all Coinbase API interactions with consistent formatting"""
 
@@ -19,6 +37,28 @@ class CoinbaseAPI:
         self.base_url = "https://api.coinbase.com/v2"
         self.api_version = "2024-01-01"
 
+        # One pooled session so paginated requests reuse their TLS connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.token}',
+            'CB-VERSION': self.api_version,
+            'Accept': 'application/json'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=MAX_CONCURRENT_ACCOUNTS,
+            max_retries=Retry(
+                total=2,  # 3 attempts in total
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # Shared by the paging threads so the combined request rate stays limited
+        self._rate_limit_lock = threading.Lock()
+        self._next_request_at = 0.0
+
     def get_user_info(self) -> dict:
         """Get user info from Coinbase API"""
         return self._make_request('user')
@@ -38,88 +78,91 @@ class CoinbaseAPI:
         return response.get('data', []), response.get('pagination', {}).get('next_uri')
 
     def _make_request(self, endpoint: str) -> dict:
-        """Make request to Coinbase API with retries"""
-        headers = {
-            'Authorization': f'Bearer {self.token}',
-            'CB-VERSION': self.api_version,
-            'Accept': 'application/json'
-        }
+        """Make request to Coinbase API; retries are handled by the session's adapter"""
+        response = self.session.get(f'{self.base_url}/{endpoint}', timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def _wait_for_rate_limit(self) -> None:
+        """Space page requests at least MIN_REQUEST_INTERVAL apart across all paging threads"""
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            if self._next_request_at > now:
+                time.sleep(self._next_request_at - now)
+                now = self._next_request_at
+            self._next_request_at = now + MIN_REQUEST_INTERVAL
+
+    def _get_account_transactions(self, account_id: str) -> List[Dict]:
+        """Get all transactions of one account, following its pagination"""
+        account_transactions = []
+        has_more = True
+        starting_after = None
+
+        while has_more:
+            self._wait_for_rate_limit()
+            transactions, next_uri = self.get_transactions(account_id, starting_after)
+            account_transactions.extend(transactions)
+
+            if next_uri:
+                try:
+                    starting_after = next_uri.split('starting_after=')[1].split('&')[0]
+                    has_more = True
+                except (IndexError, AttributeError):
+                    has_more = False
+            else:
+                has_more = False
 
-        for attempt in range(3):  # 3 retries
-            try:
-                response = requests.get(
-                    f'{self.base_url}/{endpoint}',
-                    headers=headers
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                if attempt == 2:  # Last attempt
-                    raise
-                logger.warning(f"Retrying request after error: {e}")
-                time.sleep(1)  # Wait before retry
+        return account_transactions
 
     def get_all_transactions(self) -> List[Dict]:
         """Get all transactions with pagination handling"""
         accounts = self.get_accounts()
         all_transactions = []
 
-        for account in accounts:
-            has_more = True
-            starting_after = None
-
-            while has_more:
-                transactions, next_uri = self.get_transactions(account['id'], starting_after)
+        # Only pages within one account are sequential, so accounts are paged concurrently
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ACCOUNTS) as executor:
+            for transactions in executor.map(
+                self._get_account_transactions,
+                [account['id'] for account in accounts]
+            ):
                 all_transactions.extend(transactions)
 
-                if next_uri:
-                    try:
-                        starting_after = next_uri.split('starting_after=')[1].split('&')[0]
-                        has_more = True
-                    except (IndexError, AttributeError):
-                        has_more = False
-                else:
-                    has_more = False
-
-                time.sleep(0.1)  # Rate limiting
-
         return all_transactions
 
-    def _format_transaction(self, tx: Dict) -> Transaction:
-        """Format a single transaction into our domain model"""
-        native_amount = abs(float(tx['native_amount']['amount']))
-        quantity = abs(float(tx['amount']['amount']))
-
-        return Transaction(
-            type=tx['type'],
-            asset=tx['amount']['currency'],
-            quantity=quantity,
-            native_amount=native_amount,
-            timestamp=datetime.strptime(tx['created_at'], "%Y-%m-%dT%H:%M:%SZ")
-        )
-
-    def _calculate_stats(self, transactions: List[Dict]) -> TradingStats:
-        """Calculate trading statistics"""
+    def _process_transactions(self, transactions: List[Dict]) -> Tuple[TradingStats, List[Transaction]]:
+        """Format transactions into our domain model and calculate trading statistics in one pass"""
+        formatted_transactions = []
         unique_assets = set()
         total_volume = 0
         first_date = None
         last_date = None
 
         for tx in transactions:
+            amount = tx['amount']
+            native_amount = abs(float(tx['native_amount']['amount']))
+            timestamp = parse_timestamp(tx['created_at'])
+
+            formatted_transactions.append(Transaction(
+                type=tx['type'],
+                asset=amount['currency'],
+                quantity=abs(float(amount['amount'])),
+                native_amount=native_amount,
+                timestamp=timestamp
+            ))
+
             # Calculate volume in native currency
-            total_volume += abs(float(tx['native_amount']['amount']))
+            total_volume += native_amount
             # Track unique assets
-            unique_assets.add(tx['amount']['currency'])
+            unique_assets.add(amount['currency'])
             # Track transaction dates
-            date = datetime.strptime(tx['created_at'], "%Y-%m-%dT%H:%M:%SZ")
-            if not first_date or date < first_date:
-                first_date = date
-            if not last_date or date > last_date:
-                last_date = date
+            if first_date is None or timestamp < first_date:
+                first_date = timestamp
+            if last_date is None or timestamp > last_date:
+                last_date = timestamp
 
         activity_days = (last_date - first_date).days if first_date and last_date else 0
 
-        return TradingStats(
+        stats = TradingStats(
             total_volume=total_volume,
             transaction_count=len(transactions),
             unique_assets=list(unique_assets),
@@ -127,6 +170,7 @@ class CoinbaseAPI:
             first_transaction_date=first_date,
             last_transaction_date=last_date
         )
+        return stats, formatted_transactions
 
     def get_formatted_history(self) -> ContributionData:
         """Get formatted trading history with anonymized user data"""
@@ -136,16 +180,15 @@ class CoinbaseAPI:
 
         # Get transactions and calculate stats
         transactions = self.get_all_transactions()
-        stats = self._calculate_stats(transactions)
-        formatted_transactions = [self._format_transaction(tx) for tx in transactions]
+        stats, formatted_transactions = self._process_transactions(transactions)
 
-        # Create anonymized raw data
+        # Create anonymized raw data; orjson serializes the dataclasses directly
         raw_data = {
             'user': {
                 'id_hash': account_id_hash,
             },
-            'stats': stats.__dict__,
-            'transactions': [tx.__dict__ for tx in formatted_transactions]
+            'stats': stats,
+            'transactions': formatted_transactions
         }
 
         return ContributionData(
@@ -2,6 +2,8 @@
 import logging
 from datetime import datetime
 from typing import Optional, Tuple
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -20,30 +22,38 @@ class StorageService:
     def check_existing_contribution(self, account_id_hash: str) -> Tuple[bool, Optional[ExistingContribution]]:
         """Check if user has already contributed and get their cumulative contribution record"""
         try:
-            # Query ContributionProof table instead of UserContribution
-            previous_proofs = self.session.query(ContributionProof).filter_by(
-                account_id_hash=account_id_hash
-            ).all()
-
-            if previous_proofs:
-                # Calculate cumulative score from all previous proofs
-                total_score = sum(float(getattr(p, 'score', 0.0)) for p in previous_proofs)
-
-                # Count how many times rewards were given (proofs with score > 0)
-                times_rewarded = sum(1 for p in previous_proofs if float(getattr(p, 'score', 0.0)) > 0)
-
-                # Get the most recent contribution for other stats
-                latest_contribution = self.session.query(UserContribution).filter_by(
-                    account_id_hash=account_id_hash
-                ).order_by(UserContribution.latest_contribution_at.desc()).first()
+            # Aggregate previous proofs in SQL and join the cumulative record,
+            # so the whole check is a single round trip
+            summary = (
+                select(
+                    func.count().label('proof_count'),
+                    func.coalesce(func.sum(ContributionProof.score), 0.0).label('total_score'),
+                    # Count how many times rewards were given (proofs with score > 0)
+                    func.count().filter(ContributionProof.score > 0).label('times_rewarded')
+                )
+                .where(ContributionProof.account_id_hash == account_id_hash)
+                .subquery()
+            )
+            row = self.session.execute(
+                select(
+                    summary,
+                    UserContribution.transaction_count,
+                    UserContribution.total_volume,
+                    UserContribution.activity_period_days,
+                    UserContribution.unique_assets
+                )
+                .select_from(summary)
+                .outerjoin(UserContribution, UserContribution.account_id_hash == account_id_hash)
+            ).one()
 
+            if row.proof_count:
                 return True, ExistingContribution(
-                    times_rewarded=times_rewarded,
-                    transaction_count=getattr(latest_contribution, 'transaction_count', 0),
-                    total_volume=float(getattr(latest_contribution, 'total_volume', 0.0)),
-                    activity_period_days=getattr(latest_contribution, 'activity_period_days', 0),
-                    unique_assets=getattr(latest_contribution, 'unique_assets', 0),
-                    latest_score=total_score
+                    times_rewarded=row.times_rewarded,
+                    transaction_count=row.transaction_count or 0,
+                    total_volume=float(row.total_volume or 0.0),
+                    activity_period_days=row.activity_period_days or 0,
+                    unique_assets=row.unique_assets or 0,
+                    latest_score=float(row.total_score)
                 )
             return False, None
         except SQLAlchemyError as e:
@@ -78,51 +88,58 @@ class StorageService:
                     ]
                 }
 
-                # Update or create user contribution record
-                contribution = self.session.query(UserContribution).filter_by(
-                    account_id_hash=data.account_id_hash
-                ).first()
+                # Insert or update the user contribution record in a single statement
+                now = datetime.utcnow()
+                insert_stmt = pg_insert(UserContribution).values(
+                    account_id_hash=data.account_id_hash,
+                    transaction_count=data.stats.transaction_count,
+                    total_volume=data.stats.total_volume,
+                    activity_period_days=data.stats.activity_period_days,
+                    unique_assets=len(data.stats.unique_assets),
+                    latest_score=proof.score,
+                    times_rewarded=0,
+                    first_contribution_at=now,
+                    latest_contribution_at=now,
+                    raw_data=raw_data,
+                    encrypted_refresh_token=encrypted_refresh_token
+                )
+                excluded = insert_stmt.excluded
+                upsert_stmt = insert_stmt.on_conflict_do_update(
+                    index_elements=[UserContribution.account_id_hash],
+                    set_={
+                        'transaction_count': excluded.transaction_count,
+                        'total_volume': excluded.total_volume,
+                        'activity_period_days': excluded.activity_period_days,
+                        'unique_assets': excluded.unique_assets,
+                        'latest_score': excluded.latest_score,
+                        'latest_contribution_at': excluded.latest_contribution_at,
+                        'raw_data': excluded.raw_data,
+                        # Keep the stored refresh token unless a new one was provided
+                        'encrypted_refresh_token': func.coalesce(
+                            func.nullif(excluded.encrypted_refresh_token, ''),
+                            UserContribution.encrypted_refresh_token
+                        ),
+                    }
+                )
+                self.session.execute(upsert_stmt)
 
-                if contribution:
-                    contribution.transaction_count = data.stats.transaction_count
-                    contribution.total_volume = data.stats.total_volume
-                    contribution.activity_period_days = data.stats.activity_period_days
-                    contribution.unique_assets = len(data.stats.unique_assets)
-                    contribution.latest_score = proof.score
-                    contribution.latest_contribution_at = datetime.utcnow()
-                    contribution.raw_data = raw_data
-                    # Update encrypted refresh token if provided
-                    if encrypted_refresh_token:
-                        contribution.encrypted_refresh_token = encrypted_refresh_token
-                else:
-                    contribution = UserContribution(
+                # Store proof details with a plain INSERT, skipping the ORM flush
+                self.session.execute(
+                    insert(ContributionProof).values(
                         account_id_hash=data.account_id_hash,
-                        transaction_count=data.stats.transaction_count,
-                        total_volume=data.stats.total_volume,
-                        activity_period_days=data.stats.activity_period_days,
-                        unique_assets=len(data.stats.unique_assets),
-                        latest_score=proof.score,
-                        times_rewarded=0,
-                        raw_data=raw_data,
-                        encrypted_refresh_token=encrypted_refresh_token
+                        file_id=file_id,
+                        file_url=file_url,
+                        job_id=job_id,
+                        owner_address=owner_address,
+                        score=proof.score,
+                        authenticity=proof.authenticity,
+                        ownership=proof.ownership,
+                        quality=proof.quality,
+                        uniqueness=proof.uniqueness
                     )
-                    self.session.add(contribution)
-
-                # Store proof details
-                proof_record = ContributionProof(
-                    account_id_hash=data.account_id_hash,
-                    file_id=file_id,
-                    file_url=file_url,
-                    job_id=job_id,
-                    owner_address=owner_address,
-                    score=proof.score,
-                    authenticity=proof.authenticity,
-                    ownership=proof.ownership,
-                    quality=proof.quality,
-                    uniqueness=proof.uniqueness
                 )
-                self.session.add(proof_record)
 
+                # Both statements commit in the same transaction
                 self.session.commit()
         except SQLAlchemyError as e:
             self.session.rollback()